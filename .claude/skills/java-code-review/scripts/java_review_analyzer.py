@@ -10,16 +10,229 @@ This script analyzes Java code for:
 
 import sys
 import re
+import bisect
 import os
+import mmap
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple
 
+try:
+    import hyperscan  # optional: multi-pattern DFA backend
+except ImportError:
+    hyperscan = None
+
+try:
+    import numpy as np  # optional: vectorised newline index and line lookup
+except ImportError:
+    np = None
+
+try:
+    import ahocorasick  # optional: literal prefilter for the re backend
+except ImportError:
+    ahocorasick = None
+
+# SQL keywords flagged as potential injection points, matched case-insensitively
+SQL_KEYWORDS = ("select", "from", "where", "update", "delete")
+
+# A line holding a complete return statement; the line after it is flagged
+# as unreachable unless it closes the block, starts a new case or is a comment
+_RETURN_RE = re.compile(rb'^[ \t]*return\b[^\n]*;[ \t\r]*$', re.MULTILINE)
+_REACHABLE_AFTER_RETURN = (b'}', b'//', b'/*', b'*', b'case ', b'default')
+
+# Bytes of content lower-cased at a time for the case-insensitive literal
+# searches, so a large mapped file is never copied whole
+LOWER_WINDOW = 1 << 20
+
+# VCS, IDE and build output directories skipped when walking a directory.
+# Below a "src" directory "target"/"build" are package names, so only the
+# first set is pruned there.
+SOURCE_SKIP_DIRS = {'.git', '.idea', 'node_modules'}
+SKIP_DIRS = SOURCE_SKIP_DIRS | {'target', 'build'}
+# Build files marking the directory a walk root's "src" ancestors are looked for in
+PROJECT_FILES = ('pom.xml', 'build.gradle', 'build.gradle.kts')
+
+
+def _union(patterns: List[str], flags: int = 0) -> re.Pattern:
+    """Compile a list of patterns into a single bytes alternation."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns).encode(), flags)
+
+
+def _fused_union(groups: List[Tuple[str, List[str], int]]) -> re.Pattern:
+    """Compile (name, patterns, flags) groups into one alternation of named groups.
+
+    ``match.lastgroup`` names the group a match came from; flags are scoped
+    to their group.
+    """
+    alternatives = []
+    for name, patterns, flags in groups:
+        body = "|".join(f"(?:{p})" for p in patterns)
+        if flags & re.IGNORECASE:
+            body = f"(?i:{body})"
+        alternatives.append(f"(?P<{name}>{body})")
+    return re.compile("|".join(alternatives).encode())
+
+
+def _line_bounds(data: bytes, newlines, line_num: int) -> Tuple[int, int]:
+    """Return the (start, end) offsets of 1-based line ``line_num``."""
+    start = int(newlines[line_num - 2]) + 1 if line_num > 1 else 0
+    end = int(newlines[line_num - 1]) if line_num <= len(newlines) else len(data)
+    return start, end
+
+
+def _newline_index(data: bytes):
+    """Return the offsets of every newline in ``data``, in ascending order."""
+    if np is not None:
+        return np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 0x0A)
+    # find() on bytes/mmap is a memchr scan, cheaper than a regex per match
+    newlines = []
+    pos = data.find(b'\n')
+    while pos >= 0:
+        newlines.append(pos)
+        pos = data.find(b'\n', pos + 1)
+    return newlines
+
+
+def _line_numbers(newlines, offsets: List[int]) -> List[int]:
+    """Map byte offsets to 1-based line numbers in one batch."""
+    if np is not None:
+        return (np.searchsorted(newlines, offsets) + 1).tolist()
+    return [bisect.bisect_left(newlines, offset) + 1 for offset in offsets]
+
+
+def _lines_from_spans(data: bytes, newlines, pattern: re.Pattern,
+                      spans: List[Tuple[int, int]]) -> set:
+    """Return the numbers of the lines holding a match, given match spans."""
+    firsts = _line_numbers(newlines, [start for start, _ in spans])
+    lasts = _line_numbers(newlines, [end for _, end in spans])
+    hits = set()
+    spanned = set()
+    for first, last in zip(firsts, lasts):
+        if first == last:
+            hits.add(first)
+        else:
+            spanned.update(range(first, last + 1))
+    # Patterns are line-oriented: a match running across lines is not a
+    # finding, but it may hide one, so recheck each line it covered
+    for line_num in spanned - hits:
+        if pattern.search(data, *_line_bounds(data, newlines, line_num)):
+            hits.add(line_num)
+    return hits
+
+
+def _lowered_windows(data: bytes, overlap: int):
+    """Yield (offset, lower-cased slice) windows of at most LOWER_WINDOW bytes.
+
+    Consecutive windows share ``overlap`` bytes, so any literal of up to
+    ``overlap + 1`` bytes lies wholly inside one of them. bytes.lower() only
+    folds ASCII, so offsets within a window line up with ``data``.
+    """
+    start = 0
+    while True:
+        end = min(start + LOWER_WINDOW, len(data))
+        yield start, data[start:end].lower()
+        if end == len(data):
+            return
+        start = end - overlap
+
+
+def _keyword_lines(data: bytes, newlines, keywords: List[bytes]) -> set:
+    """Return the numbers of the lines of ``data`` holding a lower-case keyword, in any case."""
+    offsets = []
+    for base, text in _lowered_windows(data, max(map(len, keywords)) - 1):
+        for keyword in keywords:
+            pos = text.find(keyword)
+            while pos >= 0:
+                offsets.append(base + pos)
+                pos = text.find(keyword, pos + len(keyword))
+    return set(_line_numbers(newlines, offsets))
+
+
+def _unreachable_lines(data: bytes, newlines) -> set:
+    """Return the numbers of non-empty lines directly following a return statement."""
+    hits = set()
+    returns = _line_numbers(newlines, [m.start() for m in _RETURN_RE.finditer(data)])
+    for line_num in returns:
+        if line_num > len(newlines):
+            continue  # return on the last line
+        line = data[slice(*_line_bounds(data, newlines, line_num + 1))].strip()
+        if line and not line.startswith(_REACHABLE_AFTER_RETURN):
+            hits.add(line_num + 1)
+    return hits
+
+
+def _hyperscan_database(groups: List[Tuple[List[str], int]]):
+    """Compile (patterns, flags) groups into one Hyperscan block-mode database.
+
+    Returns the database and, indexed by match id, the group of each pattern.
+    """
+    expressions, ids, hs_flags, owners = [], [], [], []
+    for group, (patterns, flags) in enumerate(groups):
+        pattern_flags = hyperscan.HS_FLAG_SOM_LEFTMOST
+        if flags & re.IGNORECASE:
+            pattern_flags |= hyperscan.HS_FLAG_CASELESS
+        for p in patterns:
+            ids.append(len(expressions))
+            expressions.append(p.encode())
+            hs_flags.append(pattern_flags)
+            owners.append(group)
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    db.compile(expressions=expressions, ids=ids, elements=len(expressions), flags=hs_flags)
+    return db, owners
+
+
+def _literal_automaton(words: List[str]):
+    """Build an Aho-Corasick automaton over the lower-cased ``words``."""
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word.lower(), word)
+    automaton.make_automaton()
+    return automaton
+
+
+def _in_source_tree(root: str) -> bool:
+    """Return whether ``root`` lies below a "src" directory of its project.
+
+    Only the directories between ``root`` and the nearest enclosing project
+    (see PROJECT_FILES) count, so neither the spelling of ``root`` nor a
+    "src" above the project changes the result. Outside any project only
+    the directories below ``root`` decide, as the walk enters them.
+    """
+    path = os.path.realpath(root)
+    names = []
+    while True:
+        if any(os.path.isfile(os.path.join(path, f)) for f in PROJECT_FILES):
+            return 'src' in names
+        parent, name = os.path.split(path)
+        if parent == path:
+            return False
+        names.append(name)
+        path = parent
+
+
+def _iter_java(root: str, skip: set = None):
+    """Yield the paths of the .java files under ``root``, pruning skipped dirs."""
+    if skip is None:
+        skip = SOURCE_SKIP_DIRS if _in_source_tree(root) else SKIP_DIRS
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in skip:
+                yield from _iter_java(entry.path, SOURCE_SKIP_DIRS if entry.name == 'src' else skip)
+        elif entry.name.endswith('.java'):
+            yield entry.path
+
 
 class JavaReviewAnalyzer:
     def __init__(self):
         # Runtime exception patterns
         self.runtime_exception_patterns = [
             # Potential NullPointerException - look for .length() on possibly null strings
-            r'\b([a-zA-Z_][a-zA-Z0-9_]*)\s*\.\s*length\s*\(\s*\)',
+            # (the identifier must not follow a letter; bytes \b would treat the
+            # UTF-8 bytes of e.g. "é" as a boundary)
+            r'(?:(?m:^)|[^\w\x80-\xff])([a-zA-Z_][a-zA-Z0-9_]*)\s*\.\s*length\s*\(\s*\)',
             # Array access without bounds check
             r'\[[a-zA-Z_][a-zA-Z0-9_.\[\]]*\]',  # Array access patterns
             # parseInt without try-catch
@@ -31,8 +244,7 @@ class JavaReviewAnalyzer:
 
         # Security vulnerability patterns
         self.security_patterns = [
-            # SQL injection - more comprehensive pattern
-            r'[Ss][Ee][Ll][Ee][Cc][Tt]|[Ff][Rr][Oo][Mm]|[Ww][Hh][Ee][Rr][Ee]|[Uu][Pp][Dd][Aa][Tt][Ee]|[Dd][Ee][Ll][Ee][Tt][Ee]',
+            # SQL injection (SQL keywords are matched separately, see SQL_KEYWORDS)
             r'(statement|query)\s*\+',
             r'execute\s*\(\s*[a-zA-Z_][a-zA-Z0-9_]*\s*\)',
             # Command injection
@@ -47,79 +259,171 @@ class JavaReviewAnalyzer:
             r'secret\s*=\s*"[^"]+"',
         ]
 
+        # Every security pattern contains at least one of these literals, so
+        # lines without any can be skipped
+        self.security_anchors = [
+            'statement', 'query', 'execute', 'Runtime.getRuntime', 'ProcessBuilder',
+            'request', 'password', 'apiKey', 'secret',
+        ]
+
         # Semantic issue patterns
         self.semantic_patterns = [
             # Equals without hashCode
             r'public boolean equals\s*\(\s*Object\s+',
             # Infinite loops
             r'while\s*\(\s*true\s*\)',
-            # Unreachable code after return
-            r'return\s+.+[\r\n].*[^{}]+',
+            # Unreachable code after return: checked line-wise, see _RETURN_RE
             # Potential unused variables
             r'String\s+[a-zA-Z_][a-zA-Z0-9_]*\s*=',
         ]
 
-    def analyze_file(self, file_path: str) -> Dict[str, List[Tuple[int, str, str]]]:
-        """Analyze a Java file for potential issues."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        categories = [
+            ('runtime_exceptions', self.runtime_exception_patterns, 0,
+             "Potential runtime exception"),
+            # Identifiers such as PASSWORD / ApiKey vary in case
+            ('security_vulnerabilities', self.security_patterns, re.IGNORECASE,
+             "Potential security vulnerability"),
+            ('semantic_issues', self.semantic_patterns, 0,
+             "Potential semantic issue"),
+        ]
 
-        lines = content.splitlines()
-        results = {
-            'runtime_exceptions': [],
-            'security_vulnerabilities': [],
-            'semantic_issues': []
-        }
+        # One compiled alternation per category, so each line is scanned once
+        # per category instead of once per pattern
+        self._checks = [
+            (category, _union(patterns, flags), description)
+            for category, patterns, flags, description in categories
+        ]
 
-        # Check for runtime exception patterns
-        for i, line in enumerate(lines, 1):
-            for pattern in self.runtime_exception_patterns:
-                if re.search(pattern, line):
-                    results['runtime_exceptions'].append((i, line.strip(), "Potential runtime exception"))
+        # Case-insensitive keywords (by category), found with plain substring
+        # search on the lower-cased content rather than a case-folding regex
+        self._keywords = {'security_vulnerabilities': [k.encode() for k in SQL_KEYWORDS]}
 
-        # Check for security vulnerability patterns
-        for i, line in enumerate(lines, 1):
-            for pattern in self.security_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    results['security_vulnerabilities'].append((i, line.strip(), "Potential security vulnerability"))
+        # Literal prefilters (by category) for the re backend, when
+        # pyahocorasick is installed
+        self._prefilters = {}
+        if ahocorasick is not None:
+            self._prefilters['security_vulnerabilities'] = (
+                _literal_automaton(self.security_anchors),
+                max(map(len, self.security_anchors)))
 
-        # Check for semantic issues
-        for i, line in enumerate(lines, 1):
-            for pattern in self.semantic_patterns:
-                if re.search(pattern, line):
-                    results['semantic_issues'].append((i, line.strip(), "Potential semantic issue"))
+        # The remaining categories are fused into one alternation, so the re
+        # backend scans the content once; a match names its category through
+        # the group it came from
+        self._fused = _fused_union([
+            (category, patterns, flags)
+            for category, patterns, flags, _ in categories
+            if category not in self._prefilters
+        ])
 
-        return results
+        # Hyperscan, when installed, scans all patterns of all categories in
+        # a single pass, reporting overlapping matches by pattern id; the re
+        # backend remains the fallback
+        self._database = None
+        if hyperscan is not None:
+            try:
+                self._database, owners = _hyperscan_database(
+                    [(patterns, flags) for _, patterns, flags, _ in categories])
+                self._pattern_categories = [categories[group][0] for group in owners]
+            except hyperscan.error:
+                self._database = None
+
+    def analyze_file(self, file_path: str) -> Dict[str, List[Tuple[int, str, str]]]:
+        """Analyze a Java file for potential issues."""
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return self._scan(b'')
+            # Scan the mapped file in place; only reported lines are copied out
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self._scan(data)
 
     def analyze_code_snippet(self, code: str) -> Dict[str, List[Tuple[int, str, str]]]:
         """Analyze a Java code snippet for potential issues."""
-        lines = code.splitlines()
+        return self._scan(code.encode('utf-8'))
+
+    def _scan(self, data: bytes) -> Dict[str, List[Tuple[int, str, str]]]:
+        """Run every category's checks once over the UTF-8 encoded content."""
         results = {
             'runtime_exceptions': [],
             'security_vulnerabilities': [],
             'semantic_issues': []
         }
+        newlines = _newline_index(data)
 
-        # Check for runtime exception patterns
-        for i, line in enumerate(lines, 1):
-            for pattern in self.runtime_exception_patterns:
-                if re.search(pattern, line):
-                    results['runtime_exceptions'].append((i, line.strip(), "Potential runtime exception"))
-
-        # Check for security vulnerability patterns
-        for i, line in enumerate(lines, 1):
-            for pattern in self.security_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    results['security_vulnerabilities'].append((i, line.strip(), "Potential security vulnerability"))
+        if self._database is not None:
+            line_sets = self._hyperscan_lines(data, newlines)
+        else:
+            line_sets = self._re_lines(data, newlines)
+        line_sets['semantic_issues'] |= _unreachable_lines(data, newlines)
 
-        # Check for semantic issues
-        for i, line in enumerate(lines, 1):
-            for pattern in self.semantic_patterns:
-                if re.search(pattern, line):
-                    results['semantic_issues'].append((i, line.strip(), "Potential semantic issue"))
+        for category, _, description in self._checks:
+            hits = line_sets[category]
+            keywords = self._keywords.get(category)
+            if keywords:
+                hits |= _keyword_lines(data, newlines, keywords)
+            for line_num in sorted(hits):
+                line_start, line_end = _line_bounds(data, newlines, line_num)
+                line = data[line_start:line_end].decode('utf-8', 'replace')
+                results[category].append((line_num, line.strip(), description))
 
         return results
 
+    def _re_lines(self, data: bytes, newlines) -> Dict[str, set]:
+        """Return the matching line numbers of each category using ``re``."""
+        patterns = {category: pattern for category, pattern, _ in self._checks}
+        line_sets = {category: set() for category in patterns}
+
+        # One pass over the fused alternation. It reports one leftmost match
+        # at a time, so a match may hide another category's match on the
+        # same line: a confined match is a hit for its own category, and
+        # every line a match touched is rechecked for the categories it did
+        # not already hit
+        matches = [(m.start(), m.end(), m.lastgroup) for m in self._fused.finditer(data)]
+        firsts = _line_numbers(newlines, [start for start, _, _ in matches])
+        lasts = _line_numbers(newlines, [end for _, end, _ in matches])
+        touched = set()
+        for first, last, (_, _, category) in zip(firsts, lasts, matches):
+            if first == last:
+                line_sets[category].add(first)
+            touched.update(range(first, last + 1))
+        fused = [category for category in patterns if category not in self._prefilters]
+        for line_num in touched:
+            bounds = None
+            for category in fused:
+                if line_num in line_sets[category]:
+                    continue
+                if bounds is None:
+                    bounds = _line_bounds(data, newlines, line_num)
+                if patterns[category].search(data, *bounds):
+                    line_sets[category].add(line_num)
+
+        for category, (prefilter, longest) in self._prefilters.items():
+            # Only lines holding an anchor literal can match; latin-1 maps
+            # each byte to one character, so automaton offsets are byte offsets
+            ends = [
+                base + end
+                for base, text in _lowered_windows(data, longest - 1)
+                for end, _ in prefilter.iter(text.decode('latin-1'))
+            ]
+            candidates = set(_line_numbers(newlines, ends))
+            line_sets[category] = {
+                line_num for line_num in candidates
+                if patterns[category].search(data, *_line_bounds(data, newlines, line_num))
+            }
+        return line_sets
+
+    def _hyperscan_lines(self, data: bytes, newlines) -> Dict[str, set]:
+        """Return the matching line numbers of each category using Hyperscan."""
+        spans = {category: [] for category, _, _ in self._checks}
+
+        def on_match(pattern_id, start, end, _flags, _context):
+            spans[self._pattern_categories[pattern_id]].append((start, end))
+
+        self._database.scan(data, match_event_handler=on_match)
+        return {
+            category: _lines_from_spans(data, newlines, pattern, spans[category])
+            for category, pattern, _ in self._checks
+        }
+
     def print_results(self, results: Dict[str, List[Tuple[int, str, str]]], file_path: str = None):
         """Print analysis results in a structured format."""
         print(f"\n{'='*60}")
@@ -147,6 +451,17 @@ class JavaReviewAnalyzer:
                 print(f"\n{title}: No issues detected")
 
 
+_worker_analyzer = None
+
+
+def _analyze_file(file_path: str) -> Dict[str, List[Tuple[int, str, str]]]:
+    """Process pool entry point; each worker builds its analyzer once."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = JavaReviewAnalyzer()
+    return _worker_analyzer.analyze_file(file_path)
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python java_review_analyzer.py <java_file_or_directory>")
@@ -166,12 +481,15 @@ def main():
             analyzer.print_results(results, target)
         elif os.path.isdir(target):
             # Analyze all Java files in directory
-            for root, dirs, files in os.walk(target):
-                for file in files:
-                    if file.endswith('.java'):
-                        file_path = os.path.join(root, file)
-                        results = analyzer.analyze_file(file_path)
-                        analyzer.print_results(results, file_path)
+            file_paths = list(_iter_java(target))
+            if len(file_paths) < 2:
+                all_results = map(analyzer.analyze_file, file_paths)
+            else:
+                # Files are independent, so spread the scanning across cores
+                with ProcessPoolExecutor() as executor:
+                    all_results = list(executor.map(_analyze_file, file_paths, chunksize=16))
+            for file_path, results in zip(file_paths, all_results):
+                analyzer.print_results(results, file_path)
         else:
             # Analyze as code snippet passed as argument
             code_input = ' '.join(sys.argv[1:])
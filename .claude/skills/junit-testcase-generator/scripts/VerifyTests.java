@@ -3,9 +3,17 @@ import java.nio.charset.StandardCharsets;
 import java.nio.file.*;
 import java.nio.file.attribute.BasicFileAttributes;
 import java.util.*;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
 import java.util.concurrent.TimeUnit;
 import java.util.regex.*;
 import java.util.stream.Collectors;
+import javax.xml.parsers.DocumentBuilderFactory;
+import org.w3c.dom.Document;
+import org.w3c.dom.Element;
+import org.w3c.dom.NodeList;
 
 /**
  * Verify generated JUnit tests using Maven.
@@ -16,14 +24,99 @@ import java.util.stream.Collectors;
  *   --project-root <path>    Project root containing pom.xml (default: .)
  *   --compile-only           Only compile, don't run tests
  *   --test-class <name>      Run specific test class only
+ *   --per-file               Run each test class in its own Maven invocation
+ *   --jobs <n>               Parallel Maven invocations with --per-file, each running surefire:test
+ *                            (default: CPU count with --direct-surefire, otherwise 1)
+ *   --compile-timeout <s>    Kill the test compile after this many seconds (default: 300)
+ *   --test-timeout <s>       Kill a test run after this many seconds per test class (default: 300)
+ *   --batch-timeout <s>      Upper bound on a run over several test classes (default: 1800)
+ *   --no-offline             With --per-file, skip the dependency warm-up and offline runs
+ *   --direct-surefire        Run surefire:test instead of the test phase after the shared compile;
+ *                            faster, but skips plugins bound to the lifecycle (e.g. JaCoCo's agent)
  *   --output <format>        Output format: json | summary (default: summary)
  */
 public class VerifyTests {
 
+    // VCS, IDE and build output directories skipped when looking for tests.
+    // Below a "src" directory "target"/"build" are package names, so only the
+    // first set is pruned there.
+    private static final Set<String> SOURCE_SKIP_DIRS = Set.of(".git", ".idea", "node_modules");
+    private static final Set<String> SKIP_DIRS = Set.of(".git", ".idea", "node_modules", "target", "build");
+    // Build files marking the directory a walk root's "src" ancestors are looked for in
+    private static final List<String> PROJECT_FILES = List.of("pom.xml", "build.gradle", "build.gradle.kts");
+
+    // Seconds a Maven compile / test run may take before it is killed; a run
+    // over several classes gets testTimeout per class, up to batchTimeout
+    static long compileTimeout = 300;
+    static long testTimeout = 300;
+    static long batchTimeout = 1800;
+
+    // Whether per-file verification may resolve dependencies up front, and
+    // whether Maven runs offline (-o) once that succeeded, until a run misses
+    // an artifact the warm-up did not fetch
+    static boolean warmUp = true;
+    static volatile boolean offline = false;
+
+    // Whether tests run through surefire:test alone rather than the lifecycle
+    // up to the test phase (which also runs e.g. jacoco:prepare-agent)
+    static boolean directSurefire = false;
+
+    // Longest -Dtest value passed to one Maven run, well below the 8191
+    // characters cmd.exe accepts on Windows
+    private static final int MAX_TEST_ARG_CHARS = 4000;
+
+    // Bytes of a test source searched for its package and class declarations
+    private static final int HEAD_BYTES = 8192;
+
+    private static final Pattern PACKAGE_PATTERN = Pattern.compile("package\\s+([\\w.]+)\\s*;");
+    private static final Pattern CLASS_PATTERN = Pattern.compile("class\\s+(\\w+)");
+    // Maven's error for an artifact that is not in the local repository:
+    // "Cannot access central (...) in offline mode and the artifact ... has
+    // not been downloaded from it before"
+    private static final Pattern OFFLINE_MISS_PATTERN = Pattern.compile("in offline mode");
+    private static final Pattern SUMMARY_PATTERN =
+            Pattern.compile("Tests run:\\s*(\\d+),\\s*Failures:\\s*(\\d+),\\s*Errors:\\s*(\\d+),\\s*Skipped:\\s*(\\d+)");
+    private static final Pattern FAILURE_PATTERN =
+            Pattern.compile("(\\w+)\\(([^)]+)\\)\\s+Time elapsed:.*?<<<\\s*(FAILURE|ERROR)!\\s*\\n(.*?)(?=\\n\\n|\\n\\w+\\(|$)",
+                    Pattern.DOTALL);
+    private static final Pattern ERROR_PATTERN =
+            Pattern.compile("\\[ERROR\\]\\s*([^:\\[\\]]+\\.java):\\[(\\d+),(\\d+)\\]\\s*(?:error:)?\\s*(.+)",
+                    Pattern.MULTILINE);
+    private static final Pattern ALT_ERROR_PATTERN =
+            Pattern.compile("\\[ERROR\\]\\s*([^:\\[\\]]+\\.java):(\\d+):\\s*(?:error:)?\\s*(.+)",
+                    Pattern.MULTILINE);
+
+    // Compilation error keywords in priority order, and the category of each;
+    // "cannot find symbol" (null) is refined by the kind of symbol
+    private static final Map<String, String> ERROR_KEYWORDS = new LinkedHashMap<>();
+    private static final Map<String, String> SYMBOL_KINDS = new LinkedHashMap<>();
+    private static final Pattern ERROR_KEYWORD_PATTERN;
+    private static final Pattern SYMBOL_KIND_PATTERN;
+
+    static {
+        ERROR_KEYWORDS.put("cannot find symbol", null);
+        ERROR_KEYWORDS.put("incompatible types", "type_mismatch");
+        ERROR_KEYWORDS.put("cannot be applied", "wrong_arguments");
+        ERROR_KEYWORDS.put("is not visible", "access_modifier");
+        ERROR_KEYWORDS.put("has private access", "access_modifier");
+        ERROR_KEYWORDS.put("package does not exist", "missing_dependency");
+        ERROR_KEYWORDS.put("unreported exception", "unhandled_exception");
+        ERROR_KEYWORDS.put("cannot access", "missing_import");
+        ERROR_KEYWORDS.put("non-static", "static_context");
+        SYMBOL_KINDS.put("class", "missing_import");
+        SYMBOL_KINDS.put("method", "wrong_method_name");
+        SYMBOL_KINDS.put("variable", "wrong_variable");
+        ERROR_KEYWORD_PATTERN = Pattern.compile(ERROR_KEYWORDS.keySet().stream()
+                .map(Pattern::quote).collect(Collectors.joining("|")));
+        SYMBOL_KIND_PATTERN = Pattern.compile(String.join("|", SYMBOL_KINDS.keySet()));
+    }
+
     public static void main(String[] args) {
         String testFolder = "src/test/java";
         String projectRoot = ".";
         boolean compileOnly = false;
+        boolean perFile = false;
+        Integer jobs = null;
         String testClass = null;
         String output = "summary";
 
@@ -35,6 +128,27 @@ public class VerifyTests {
                 case "--compile-only":
                     compileOnly = true;
                     break;
+                case "--per-file":
+                    perFile = true;
+                    break;
+                case "--jobs":
+                    jobs = Integer.parseInt(args[++i]);
+                    break;
+                case "--compile-timeout":
+                    compileTimeout = Long.parseLong(args[++i]);
+                    break;
+                case "--test-timeout":
+                    testTimeout = Long.parseLong(args[++i]);
+                    break;
+                case "--batch-timeout":
+                    batchTimeout = Long.parseLong(args[++i]);
+                    break;
+                case "--no-offline":
+                    warmUp = false;
+                    break;
+                case "--direct-surefire":
+                    directSurefire = true;
+                    break;
                 case "--test-class":
                     testClass = args[++i];
                     break;
@@ -61,12 +175,15 @@ public class VerifyTests {
         }
 
         // Verify all tests
-        verifyAllTests(testFolder, projectRoot, !compileOnly, output);
+        // Concurrent lifecycle runs would all write target/classes and
+        // target/test-classes, so only direct Surefire runs go in parallel
+        if (jobs == null) jobs = directSurefire ? Runtime.getRuntime().availableProcessors() : 1;
+        verifyAllTests(testFolder, projectRoot, !compileOnly, perFile, jobs, output);
     }
 
     static void runSpecificTest(String projectRoot, String testClass, String output) {
         System.out.println("Running test: " + testClass);
-        String[] result = runMavenCommand(projectRoot, "test", "-Dtest=" + testClass, "-q");
+        String[] result = runMavenCommand(projectRoot, testTimeout, "test", "-Dtest=" + testClass, "-q");
         boolean success = "0".equals(result[0]);
         String mvnOutput = result[1];
         Map<String, Object> testResults = parseSurefireOutput(mvnOutput);
@@ -88,7 +205,8 @@ public class VerifyTests {
         System.exit(success ? 0 : 1);
     }
 
-    static void verifyAllTests(String testFolder, String projectRoot, boolean runTests, String output) {
+    static void verifyAllTests(String testFolder, String projectRoot, boolean runTests, boolean perFile, int jobs,
+                               String output) {
         Path testPath = Paths.get(testFolder);
         if (!Files.exists(testPath)) {
             System.err.println("Error: Test folder does not exist: " + testFolder);
@@ -106,9 +224,17 @@ public class VerifyTests {
         List<Map<String, Object>> testFailures = new ArrayList<>();
         List<String> passed = new ArrayList<>();
 
+        // Per-file verification starts a Maven build per test class: resolve
+        // everything once so that all of them can skip the remote checks
+        if (warmUp && runTests && perFile && testFiles.size() > 1) {
+            System.out.println("Resolving dependencies for offline runs...");
+            String[] warmUpResult = runMavenCommand(projectRoot, compileTimeout, "dependency:go-offline", "-q");
+            offline = "0".equals(warmUpResult[0]);
+        }
+
         // First, compile all tests
         System.out.println("Compiling all tests with Maven...");
-        String[] compileResult = runMavenCommand(projectRoot, "test-compile", "-q");
+        String[] compileResult = runMavenCommand(projectRoot, compileTimeout, "test-compile", "-q");
         boolean compileOk = "0".equals(compileResult[0]);
         String compileOutput = compileResult[1];
 
@@ -130,10 +256,22 @@ public class VerifyTests {
 
         System.out.println("Compilation successful. Running tests...");
 
-        // Verify each test file
-        for (Path testFile : testFiles) {
-            System.out.println("  Verifying: " + testFile.getFileName());
-            Map<String, Object> verification = verifyTestFile(testFile, projectRoot, runTests);
+        // Verify all test files in one Surefire run, or each on its own
+        List<Map<String, Object>> verifications;
+        if (runTests && !perFile) {
+            System.out.println("  Verifying " + testFiles.size() + " test files in one run");
+            verifications = verifyTestFilesBatch(testFiles, projectRoot);
+        } else if (runTests && jobs > 1 && testFiles.size() > 1) {
+            verifications = verifyTestFilesParallel(testFiles, projectRoot, jobs);
+        } else {
+            verifications = new ArrayList<>();
+            for (Path testFile : testFiles) {
+                System.out.println("  Verifying: " + testFile.getFileName());
+                verifications.add(verifyTestFile(testFile, projectRoot, runTests, testGoal()));
+            }
+        }
+
+        for (Map<String, Object> verification : verifications) {
             verified.add(verification);
 
             String status = (String) verification.get("status");
@@ -217,32 +355,33 @@ public class VerifyTests {
         }
     }
 
-    static Map<String, Object> verifyTestFile(Path testFile, String projectRoot, boolean runTests) {
-        String content;
+    /**
+     * Maven goal that runs the already compiled tests. The test phase keeps
+     * lifecycle-bound plugins such as JaCoCo working, and the compiler's stale
+     * check skips up-to-date classes; with --direct-surefire only Surefire runs.
+     */
+    static String testGoal() {
+        return directSurefire ? "surefire:test" : "test";
+    }
+
+    static Map<String, Object> verifyTestFile(Path testFile, String projectRoot, boolean runTests, String goal) {
+        String fullClassName;
         try {
-            content = Files.readString(testFile, StandardCharsets.UTF_8);
+            fullClassName = resolveTestClassName(testFile);
         } catch (IOException e) {
             return Map.of("file", testFile.toString(), "status", "error", "message", "Could not read file");
         }
-
-        Matcher pkgMatcher = Pattern.compile("package\\s+([\\w.]+)\\s*;").matcher(content);
-        Matcher clsMatcher = Pattern.compile("class\\s+(\\w+)").matcher(content);
-
-        if (!clsMatcher.find()) {
+        if (fullClassName == null) {
             return Map.of("file", testFile.toString(), "status", "error", "message", "Could not parse test class name");
         }
 
-        String pkg = pkgMatcher.find() ? pkgMatcher.group(1) : "";
-        String className = clsMatcher.group(1);
-        String fullClassName = pkg.isEmpty() ? className : pkg + "." + className;
-
         Map<String, Object> result = new LinkedHashMap<>();
         result.put("file", testFile.toString());
         result.put("className", fullClassName);
         result.put("compiled", true);
 
         if (runTests) {
-            String[] testResult = runMavenCommand(projectRoot, "test", "-Dtest=" + fullClassName, "-q");
+            String[] testResult = runMavenCommand(projectRoot, testTimeout, goal, "-Dtest=" + fullClassName, "-q");
             boolean testOk = "0".equals(testResult[0]);
             String testOutput = testResult[1];
             Map<String, Object> testResults = parseSurefireOutput(testOutput);
@@ -261,9 +400,183 @@ public class VerifyTests {
         return result;
     }
 
+    /**
+     * Verify already compiled test files with as few test runs as the command
+     * line allows (see {@link #testGroups}), then split the results per class
+     * using the Surefire XML reports. A run may take {@code testTimeout}
+     * seconds per class it covers, up to {@code batchTimeout}.
+     */
+    static List<Map<String, Object>> verifyTestFilesBatch(List<Path> testFiles, String projectRoot) {
+        List<Map<String, Object>> verifications = new ArrayList<>();
+        Map<String, Map<String, Object>> byClass = new LinkedHashMap<>();
+        Path reportDir = Paths.get(projectRoot, "target", "surefire-reports");
+        for (Path testFile : testFiles) {
+            String fullClassName;
+            try {
+                fullClassName = resolveTestClassName(testFile);
+            } catch (IOException e) {
+                verifications.add(Map.of("file", testFile.toString(), "status", "error", "message", "Could not read file"));
+                continue;
+            }
+            if (fullClassName == null) {
+                verifications.add(Map.of("file", testFile.toString(), "status", "error", "message", "Could not parse test class name"));
+                continue;
+            }
+            Map<String, Object> result = new LinkedHashMap<>();
+            result.put("file", testFile.toString());
+            result.put("className", fullClassName);
+            result.put("compiled", true);
+            verifications.add(result);
+            byClass.put(fullClassName, result);
+            // A stale report must not stand in for a class that did not run
+            try {
+                Files.deleteIfExists(reportDir.resolve("TEST-" + fullClassName + ".xml"));
+            } catch (IOException ignored) {
+            }
+        }
+        if (byClass.isEmpty()) return verifications;
+
+        for (List<String> group : testGroups(byClass.keySet())) {
+            long timeout = Math.max(testTimeout, Math.min(testTimeout * group.size(), batchTimeout));
+            String[] testResult = runMavenCommand(projectRoot, timeout, testGoal(),
+                    "-Dtest=" + String.join(",", group), "-q");
+            boolean testOk = "0".equals(testResult[0]);
+            String testOutput = testResult[1];
+
+            for (String className : group) {
+                Map<String, Object> result = byClass.get(className);
+                Map<String, Object> testResults = readSurefireReport(reportDir, className);
+                boolean classOk;
+                if (testResults != null) {
+                    classOk = (Integer) testResults.get("failed") == 0 && (Integer) testResults.get("errors") == 0;
+                } else {
+                    // No report to go by: fall back to the run as a whole
+                    testResults = parseSurefireOutput(testOutput);
+                    classOk = testOk;
+                }
+                result.put("status", classOk ? "passed" : "test_failure");
+                result.put("testResults", testResults);
+                if (!classOk) result.put("output", truncate(testOutput, 2000));
+            }
+        }
+        return verifications;
+    }
+
+    /**
+     * Split class names into groups whose comma-joined -Dtest value stays
+     * within {@link #MAX_TEST_ARG_CHARS}.
+     */
+    static List<List<String>> testGroups(Collection<String> classNames) {
+        List<List<String>> groups = new ArrayList<>();
+        List<String> group = new ArrayList<>();
+        int length = 0;
+        for (String className : classNames) {
+            if (!group.isEmpty() && length + 1 + className.length() > MAX_TEST_ARG_CHARS) {
+                groups.add(group);
+                group = new ArrayList<>();
+                length = 0;
+            }
+            length += (group.isEmpty() ? 0 : 1) + className.length();
+            group.add(className);
+        }
+        if (!group.isEmpty()) groups.add(group);
+        return groups;
+    }
+
+    /**
+     * Verify already compiled test files with one Maven invocation each, up
+     * to {@code jobs} at a time. Results keep the order of {@code testFiles}.
+     * Each run is a direct surefire:test, which only reads the shared
+     * target/test-classes; the test phase would recompile into it.
+     */
+    static List<Map<String, Object>> verifyTestFilesParallel(List<Path> testFiles, String projectRoot, int jobs) {
+        ExecutorService pool = Executors.newFixedThreadPool(Math.min(jobs, testFiles.size()));
+        try {
+            List<Future<Map<String, Object>>> futures = new ArrayList<>();
+            for (Path testFile : testFiles) {
+                futures.add(pool.submit(() -> {
+                    System.out.println("  Verifying: " + testFile.getFileName());
+                    return verifyTestFile(testFile, projectRoot, true, "surefire:test");
+                }));
+            }
+            List<Map<String, Object>> verifications = new ArrayList<>();
+            for (int i = 0; i < futures.size(); i++) {
+                try {
+                    verifications.add(futures.get(i).get());
+                } catch (InterruptedException | ExecutionException e) {
+                    verifications.add(Map.of("file", testFiles.get(i).toString(), "status", "error",
+                            "message", "Verification failed: " + e.getMessage()));
+                }
+            }
+            return verifications;
+        } finally {
+            pool.shutdown();
+        }
+    }
+
+    /**
+     * Return the fully qualified class name of a test file: from its path
+     * below a {@code src/test/java} root when it has one, which needs no file
+     * access, otherwise from its declarations. Null when neither yields one.
+     */
+    static String resolveTestClassName(Path testFile) throws IOException {
+        Path path = testFile.toAbsolutePath().normalize();
+        for (int i = path.getNameCount() - 4; i >= 0; i--) {
+            if ("src".equals(path.getName(i).toString())
+                    && "test".equals(path.getName(i + 1).toString())
+                    && "java".equals(path.getName(i + 2).toString())) {
+                String name = path.subpath(i + 3, path.getNameCount()).toString().replace(File.separatorChar, '.');
+                return name.substring(0, name.length() - ".java".length());
+            }
+        }
+        return readTestClassName(testFile);
+    }
+
+    /** Return the fully qualified name of the class declared in a test file, or null. */
+    static String readTestClassName(Path testFile) throws IOException {
+        // The declarations sit at the top of the file, so only its head is
+        // read, unless a long header pushes the class name past it
+        byte[] head;
+        boolean whole;
+        try (InputStream in = Files.newInputStream(testFile)) {
+            head = in.readNBytes(HEAD_BYTES);
+            whole = in.read() == -1;
+        }
+        String content = new String(head, StandardCharsets.UTF_8);
+        Matcher clsMatcher = CLASS_PATTERN.matcher(content);
+        boolean found = clsMatcher.find();
+        if (!whole && (!found || clsMatcher.end() == content.length())) {
+            content = Files.readString(testFile, StandardCharsets.UTF_8);
+            clsMatcher = CLASS_PATTERN.matcher(content);
+            found = clsMatcher.find();
+        }
+        if (!found) return null;
+
+        Matcher pkgMatcher = PACKAGE_PATTERN.matcher(content);
+        String pkg = pkgMatcher.find() ? pkgMatcher.group(1) : "";
+        String className = clsMatcher.group(1);
+        return pkg.isEmpty() ? className : pkg + "." + className;
+    }
+
     // ===== Maven command execution =====
 
-    static String[] runMavenCommand(String projectRoot, String... mavenArgs) {
+    /**
+     * Run Maven, offline once the warm-up succeeded. dependency:go-offline
+     * does not resolve everything a build loads (e.g. Surefire's test
+     * framework providers), so a run failing on a missing artifact is
+     * repeated online, and later runs stay online.
+     */
+    static String[] runMavenCommand(String projectRoot, long timeoutSeconds, String... mavenArgs) {
+        boolean offlineRun = offline;
+        String[] result = runMaven(projectRoot, timeoutSeconds, offlineRun, mavenArgs);
+        if (offlineRun && !"0".equals(result[0]) && OFFLINE_MISS_PATTERN.matcher(result[1]).find()) {
+            offline = false;
+            result = runMaven(projectRoot, timeoutSeconds, false, mavenArgs);
+        }
+        return result;
+    }
+
+    static String[] runMaven(String projectRoot, long timeoutSeconds, boolean offlineRun, String... mavenArgs) {
         List<String> cmd = new ArrayList<>();
         // Use mvn.cmd on Windows, mvn on Unix
         String os = System.getProperty("os.name", "").toLowerCase();
@@ -274,34 +587,57 @@ public class VerifyTests {
         } else {
             cmd.add("mvn");
         }
+        if (offlineRun) cmd.add("-o");
         cmd.addAll(Arrays.asList(mavenArgs));
 
+        Process process = null;
         try {
             ProcessBuilder pb = new ProcessBuilder(cmd);
             pb.directory(new File(projectRoot));
             pb.redirectErrorStream(true);
-            Process process = pb.start();
+            process = pb.start();
+            InputStream stdout = process.getInputStream();
 
+            // Drain the output on its own thread, so that the timeout also
+            // applies to a build that hangs with its output still open
             StringBuilder output = new StringBuilder();
-            try (BufferedReader reader = new BufferedReader(new InputStreamReader(process.getInputStream(), StandardCharsets.UTF_8))) {
-                String line;
-                while ((line = reader.readLine()) != null) {
-                    output.append(line).append("\n");
+            Thread drain = new Thread(() -> {
+                try (BufferedReader reader = new BufferedReader(new InputStreamReader(stdout, StandardCharsets.UTF_8))) {
+                    String line;
+                    while ((line = reader.readLine()) != null) {
+                        output.append(line).append("\n");
+                    }
+                } catch (IOException ignored) {
+                    // stream closed when the process was killed
                 }
-            }
+            });
+            drain.setDaemon(true);
+            drain.start();
 
-            boolean finished = process.waitFor(300, TimeUnit.SECONDS);
+            boolean finished = process.waitFor(timeoutSeconds, TimeUnit.SECONDS);
             if (!finished) {
-                process.destroyForcibly();
-                return new String[]{"1", "Command timed out"};
+                destroyTree(process);
+                return new String[]{"1", "Command timed out after " + timeoutSeconds + " seconds"};
             }
+            drain.join();
 
             return new String[]{String.valueOf(process.exitValue()), output.toString()};
         } catch (Exception e) {
+            if (process != null) destroyTree(process);
             return new String[]{"1", "Error executing Maven: " + e.getMessage()};
         }
     }
 
+    /**
+     * Kill a Maven run with everything it started: cmd /c (and the mvn
+     * script on Unix) do not pass a kill on to the JVM, which would otherwise
+     * keep building in target/.
+     */
+    static void destroyTree(Process process) {
+        process.descendants().forEach(ProcessHandle::destroyForcibly);
+        process.destroyForcibly();
+    }
+
     // ===== Output parsing =====
 
     static Map<String, Object> parseSurefireOutput(String output) {
@@ -314,8 +650,7 @@ public class VerifyTests {
         results.put("failures", new ArrayList<>());
 
         // Parse summary: Tests run: X, Failures: Y, Errors: Z, Skipped: W
-        Matcher m = Pattern.compile("Tests run:\\s*(\\d+),\\s*Failures:\\s*(\\d+),\\s*Errors:\\s*(\\d+),\\s*Skipped:\\s*(\\d+)")
-                .matcher(output);
+        Matcher m = SUMMARY_PATTERN.matcher(output);
         if (m.find()) {
             int total = Integer.parseInt(m.group(1));
             int failed = Integer.parseInt(m.group(2));
@@ -330,8 +665,7 @@ public class VerifyTests {
 
         // Extract failure details
         List<Map<String, String>> failures = new ArrayList<>();
-        Matcher fm = Pattern.compile("(\\w+)\\(([^)]+)\\)\\s+Time elapsed:.*?<<<\\s*(FAILURE|ERROR)!\\s*\\n(.*?)(?=\\n\\n|\\n\\w+\\(|$)",
-                Pattern.DOTALL).matcher(output);
+        Matcher fm = FAILURE_PATTERN.matcher(output);
         while (fm.find()) {
             failures.add(Map.of(
                     "method", fm.group(1),
@@ -344,13 +678,75 @@ public class VerifyTests {
         return results;
     }
 
+    /**
+     * Read the results of one test class from its Surefire XML report, in the
+     * same shape as {@link #parseSurefireOutput}. Returns null when the
+     * report is missing or unreadable.
+     */
+    static Map<String, Object> readSurefireReport(Path reportDir, String className) {
+        Path report = reportDir.resolve("TEST-" + className + ".xml");
+        if (!Files.exists(report)) return null;
+        Document doc;
+        try {
+            doc = DocumentBuilderFactory.newInstance().newDocumentBuilder().parse(report.toFile());
+        } catch (Exception e) {
+            return null;
+        }
+
+        Element suite = doc.getDocumentElement();
+        int total = parseIntAttr(suite, "tests");
+        int failed = parseIntAttr(suite, "failures");
+        int errors = parseIntAttr(suite, "errors");
+        int skipped = parseIntAttr(suite, "skipped");
+        Map<String, Object> results = new LinkedHashMap<>();
+        results.put("total", total);
+        results.put("passed", total - failed - errors - skipped);
+        results.put("failed", failed);
+        results.put("errors", errors);
+        results.put("skipped", skipped);
+
+        List<Map<String, String>> failures = new ArrayList<>();
+        NodeList testCases = suite.getElementsByTagName("testcase");
+        for (int i = 0; i < testCases.getLength(); i++) {
+            Element testCase = (Element) testCases.item(i);
+            for (String type : new String[]{"failure", "error"}) {
+                NodeList problems = testCase.getElementsByTagName(type);
+                if (problems.getLength() == 0) continue;
+                Element problem = (Element) problems.item(0);
+                // "<exception type>: <message>", as on the console; the body
+                // (stack trace) already starts with the type
+                String message = problem.getAttribute("message");
+                if (message.isEmpty()) {
+                    message = problem.getTextContent();
+                } else if (!problem.getAttribute("type").isEmpty()) {
+                    message = problem.getAttribute("type") + ": " + message;
+                }
+                failures.add(Map.of(
+                        "method", testCase.getAttribute("name"),
+                        "class", testCase.getAttribute("classname"),
+                        "type", type.toUpperCase(),
+                        "message", truncate(message.trim(), 500)
+                ));
+            }
+        }
+        results.put("failures", failures);
+        return results;
+    }
+
+    static int parseIntAttr(Element element, String name) {
+        try {
+            return Integer.parseInt(element.getAttribute(name));
+        } catch (NumberFormatException e) {
+            return 0;
+        }
+    }
+
     static List<Map<String, Object>> parseCompilationErrors(String output) {
         List<Map<String, Object>> errors = new ArrayList<>();
         Set<String> seen = new HashSet<>();
 
         // Pattern: [ERROR] /path/File.java:[line,col] error: message
-        Matcher m1 = Pattern.compile("\\[ERROR\\]\\s*([^:\\[\\]]+\\.java):\\[(\\d+),(\\d+)\\]\\s*(?:error:)?\\s*(.+)",
-                Pattern.MULTILINE).matcher(output);
+        Matcher m1 = ERROR_PATTERN.matcher(output);
         while (m1.find()) {
             String key = m1.group(1).trim() + ":" + m1.group(2);
             if (seen.add(key)) {
@@ -364,8 +760,7 @@ public class VerifyTests {
         }
 
         // Alternative: [ERROR] /path/File.java:line: error: message
-        Matcher m2 = Pattern.compile("\\[ERROR\\]\\s*([^:\\[\\]]+\\.java):(\\d+):\\s*(?:error:)?\\s*(.+)",
-                Pattern.MULTILINE).matcher(output);
+        Matcher m2 = ALT_ERROR_PATTERN.matcher(output);
         while (m2.find()) {
             String key = m2.group(1).trim() + ":" + m2.group(2);
             if (seen.add(key)) {
@@ -383,18 +778,20 @@ public class VerifyTests {
 
     static String categorizeError(Map<String, Object> error) {
         String msg = ((String) error.get("message")).toLowerCase();
-        if (msg.contains("cannot find symbol")) {
-            if (msg.contains("class")) return "missing_import";
-            if (msg.contains("method")) return "wrong_method_name";
-            if (msg.contains("variable")) return "wrong_variable";
-        }
-        if (msg.contains("incompatible types")) return "type_mismatch";
-        if (msg.contains("cannot be applied")) return "wrong_arguments";
-        if (msg.contains("is not visible") || msg.contains("has private access")) return "access_modifier";
-        if (msg.contains("package does not exist")) return "missing_dependency";
-        if (msg.contains("unreported exception")) return "unhandled_exception";
-        if (msg.contains("cannot access")) return "missing_import";
-        if (msg.contains("non-static") && msg.contains("static")) return "static_context";
+        // One pass over the message; the keywords found are then taken by priority
+        Set<String> found = new HashSet<>();
+        Matcher m = ERROR_KEYWORD_PATTERN.matcher(msg);
+        while (m.find()) found.add(m.group());
+        for (Map.Entry<String, String> keyword : ERROR_KEYWORDS.entrySet()) {
+            if (!found.contains(keyword.getKey())) continue;
+            if (keyword.getValue() != null) return keyword.getValue();
+            Set<String> kinds = new HashSet<>();
+            Matcher k = SYMBOL_KIND_PATTERN.matcher(msg);
+            while (k.find()) kinds.add(k.group());
+            for (Map.Entry<String, String> kind : SYMBOL_KINDS.entrySet()) {
+                if (kinds.contains(kind.getKey())) return kind.getValue();
+            }
+        }
         return "unknown";
     }
 
@@ -416,8 +813,19 @@ public class VerifyTests {
 
     static List<Path> findTestFiles(Path testPath) {
         List<Path> files = new ArrayList<>();
+        boolean rootInSource = inSourceTree(testPath);
         try {
             Files.walkFileTree(testPath, new SimpleFileVisitor<>() {
+                @Override
+                public FileVisitResult preVisitDirectory(Path dir, BasicFileAttributes attrs) {
+                    if (!dir.equals(testPath)) {
+                        boolean inSource = rootInSource || hasSrcName(testPath.relativize(dir.getParent()));
+                        Set<String> skip = inSource ? SOURCE_SKIP_DIRS : SKIP_DIRS;
+                        if (skip.contains(dir.getFileName().toString())) return FileVisitResult.SKIP_SUBTREE;
+                    }
+                    return FileVisitResult.CONTINUE;
+                }
+
                 @Override
                 public FileVisitResult visitFile(Path file, BasicFileAttributes attrs) {
                     if (file.getFileName().toString().endsWith("Test.java")) {
@@ -432,6 +840,37 @@ public class VerifyTests {
         return files;
     }
 
+    /**
+     * Whether the walk root lies below a "src" directory of its project. Only
+     * the directories between the root and the nearest enclosing project (see
+     * {@link #PROJECT_FILES}) count, so neither the spelling of the root nor a
+     * "src" above the project changes the result.
+     */
+    static boolean inSourceTree(Path root) {
+        Path dir;
+        try {
+            dir = root.toRealPath();
+        } catch (IOException e) {
+            dir = root.toAbsolutePath().normalize();
+        }
+        boolean belowSrc = false;
+        for (; dir != null; dir = dir.getParent()) {
+            for (String projectFile : PROJECT_FILES) {
+                if (Files.isRegularFile(dir.resolve(projectFile))) return belowSrc;
+            }
+            Path name = dir.getFileName();
+            if (name != null && "src".equals(name.toString())) belowSrc = true;
+        }
+        return false;
+    }
+
+    static boolean hasSrcName(Path relative) {
+        for (Path name : relative) {
+            if ("src".equals(name.toString())) return true;
+        }
+        return false;
+    }
+
     static String truncate(String s, int max) {
         if (s == null) return "";
         return s.length() <= max ? s : s.substring(0, max) + "...";
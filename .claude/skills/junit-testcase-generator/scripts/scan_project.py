@@ -14,17 +14,56 @@ Options:
   --exclude <pattern>     Substring to exclude from relative file paths (repeatable)
   --project-root <path>   Project root containing pom.xml (default: .)
   --output <format>       json | summary | pending  (default: summary)
+  --jobs <n>              Worker processes for parsing (default: CPU count; 1 = no pool)
 
 Exit codes: 0 = success, 1 = error (missing pom.xml or source folder)
 """
 
+import itertools
 import json
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson  # optional: faster JSON encoding
+except ImportError:
+    orjson = None
+
+# VCS and IDE directories never descended into. Unlike a project-wide walk,
+# "target"/"build" are not pruned: under a source root they are package names.
+SKIP_DIRS = {".git", ".idea", "node_modules"}
+
+# Files handed to the parser pool per walk step
+BATCH_SIZE = 256
+
+# Java declaration patterns, compiled once per process
+_PKG_RE = re.compile(r"package\s+([\w.]+)\s*;")
+_CLASS_RE = re.compile(
+    r"(?P<mods>(?:(?:public|abstract|final|static|sealed|non-sealed)\s+)*)"
+    r"\b(?P<kind>class|interface|enum|record)\s+(?P<name>\w+)"
+)
+_METHOD_RE = re.compile(
+    r"(?P<visibility>public|private|protected)?\s*"
+    r"(?P<static>static)?\s*"
+    r"(?P<final>final)?\s*"
+    r"(?P<returnType>[\w<>,\s\[\]]+)\s+"
+    r"(?P<name>\w+)\s*"
+    r"\((?P<params>[^)]*)\)\s*"
+    r"(?:throws\s+(?P<throws>[\w,\s]+))?\s*\{",
+    re.MULTILINE,
+)
+_FIELD_RE = re.compile(r"private\s+(?:final\s+)?([\w]+(?:<[^>]+>)?)\s+(\w+)\s*[;=]")
+
+# Field types that are never collaborators worth mocking (compared lower-cased)
+_SKIP_TYPES = frozenset({
+    "int", "long", "double", "float", "boolean",
+    "string", "integer", "list", "map", "set", "optional",
+})
+
 
 def main():
     source_folder = "src/main/java"
@@ -32,6 +71,7 @@ def main():
     project_root = "."
     output_format = "summary"
     exclusions = []
+    jobs = None
 
     args = sys.argv[1:]
     i = 0
@@ -45,19 +85,21 @@ def main():
             project_root = args[i + 1]; i += 2
         elif a == "--output":
             output_format = args[i + 1]; i += 2
+        elif a == "--jobs":
+            jobs = int(args[i + 1]); i += 2
         elif not a.startswith("--"):
             source_folder = a; i += 1
         else:
             i += 1
 
-    pom_path = Path(project_root) / "pom.xml"
-    if not pom_path.exists():
+    # A single read both checks for pom.xml and inspects it
+    deps = check_maven_dependencies(Path(project_root) / "pom.xml")
+    if not deps["hasPom"]:
         print(f"Error: No pom.xml found at {project_root}. This skill requires a Maven project.",
               file=sys.stderr)
         sys.exit(1)
 
-    deps = check_maven_dependencies(pom_path)
-    classes = scan_source_files(source_folder, test_folder, exclusions)
+    classes = scan_source_files(source_folder, test_folder, exclusions, jobs)
 
     total         = len(classes)
     pending_count = sum(1 for c in classes if c["status"] == "pending")
@@ -66,7 +108,7 @@ def main():
     with_private  = sum(1 for c in classes if c["hasPrivateMethods"])
 
     if output_format == "json":
-        print(json.dumps({
+        _print_json({
             "scannedAt":          datetime.now(timezone.utc).isoformat(),
             "sourceFolder":       source_folder,
             "testFolder":         test_folder,
@@ -80,11 +122,11 @@ def main():
                 "withPrivateMethods":with_private,
             },
             "classes": classes,
-        }, indent=2))
+        })
 
     elif output_format == "pending":
         pending = [c for c in classes if c["status"] == "pending"]
-        print(json.dumps(pending, indent=2))
+        _print_json(pending)
 
     else:  # summary
         print("\n=== Maven Project Scan Results ===")
@@ -107,6 +149,17 @@ def main():
             print("Run with --output json to get full class details.")
 
 
+def _print_json(data) -> None:
+    if orjson is not None:
+        # orjson leaves non-ASCII text unescaped, so its UTF-8 bytes bypass the
+        # console encoding (e.g. cp1252), which could not represent them
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(data, indent=2))
+
+
 # ---------------------------------------------------------------------------
 # Maven pom.xml inspection
 # ---------------------------------------------------------------------------
@@ -129,25 +182,33 @@ def check_maven_dependencies(pom_path: Path) -> dict:
 # Source folder walker
 # ---------------------------------------------------------------------------
 
-def scan_source_files(source_folder: str, test_folder: str, exclusions: list) -> list:
+def scan_source_files(source_folder: str, test_folder: str, exclusions: list,
+                      jobs: int | None = None) -> list:
     source_path = Path(source_folder)
     if not source_path.exists():
         print(f"Error: Source folder does not exist: {source_folder}", file=sys.stderr)
         sys.exit(1)
 
-    classes = []
-    for java_file in sorted(source_path.rglob("*.java")):
-        relative = str(java_file.relative_to(source_path))
-
-        # Skip excluded paths (substring match on relative path)
-        if any(exc in relative for exc in exclusions):
-            continue
-
-        # Skip package-info and module-info
-        if java_file.stem in ("package-info", "module-info"):
-            continue
+    batches = (
+        [f for f in batch if is_scanned(f, source_path, exclusions)]
+        for batch in find_java_files(source_path)
+    )
+    # Walk far enough to tell a scan of just one file from a larger one
+    head = list(itertools.islice(batches, 2))
+    batches = itertools.chain(head, batches)
+
+    if jobs == 1 or (len(head) < 2 and sum(map(len, head)) < 2):
+        infos = [extract_class_info(f) for batch in batches for f in batch]
+    else:
+        # Files are parsed independently, so spread the work across cores.
+        # Each batch is submitted as soon as it is walked, so parsing overlaps
+        # the rest of the walk.
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            mapped = [executor.map(extract_class_info, batch, chunksize=32) for batch in batches]
+            infos = [info for results in mapped for info in results]
 
-        info = extract_class_info(java_file)
+    classes = []
+    for info in infos:
         if info is None:
             continue
 
@@ -169,6 +230,44 @@ def scan_source_files(source_folder: str, test_folder: str, exclusions: list) ->
     return classes
 
 
+def is_scanned(java_file: Path, source_path: Path, exclusions: list) -> bool:
+    relative = str(java_file.relative_to(source_path))
+
+    # Skip excluded paths (substring match on relative path)
+    if any(exc in relative for exc in exclusions):
+        return False
+
+    # Skip package-info and module-info
+    return java_file.stem not in ("package-info", "module-info")
+
+
+def find_java_files(root: Path, batch_size: int = BATCH_SIZE):
+    """Yield lists of up to batch_size .java files under root, in sorted path order."""
+    batch = []
+    for java_file in _walk_java_files(root):
+        batch.append(java_file)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _walk_java_files(root: Path):
+    # os.scandir avoids a stat per entry; visiting entries by name keeps the
+    # overall order identical to sorting the full path list
+    try:
+        entries = sorted(os.scandir(root), key=lambda e: e.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in SKIP_DIRS:
+                yield from _walk_java_files(Path(entry.path))
+        elif entry.name.endswith(".java"):
+            yield Path(entry.path)
+
+
 # ---------------------------------------------------------------------------
 # Class-level Java parser (regex-based, no external deps)
 # ---------------------------------------------------------------------------
@@ -180,29 +279,27 @@ def extract_class_info(file_path: Path) -> dict | None:
         return None
 
     # Package
-    m = re.search(r"package\s+([\w.]+)\s*;", content)
+    m = _PKG_RE.search(content)
     package = m.group(1) if m else ""
 
     # Primary type declaration
-    m = re.search(
-        r"(?:public\s+)?(?:abstract\s+)?(?:final\s+)?"
-        r"(?:class|interface|enum|record)\s+(\w+)",
-        content,
-    )
+    m = _CLASS_RE.search(content)
     if not m:
         return None
-    class_name     = m.group(1)
+    class_name     = m.group("name")
     full_class_name = f"{package}.{class_name}" if package else class_name
 
-    # Classify type
-    class_type = "class"
-    if   re.search(rf"\binterface\s+{re.escape(class_name)}", content): class_type = "interface"
-    elif re.search(rf"\benum\s+{re.escape(class_name)}",      content): class_type = "enum"
-    elif re.search(rf"\brecord\s+{re.escape(class_name)}",    content): class_type = "record"
-    elif re.search(rf"\babstract\s+class\s+{re.escape(class_name)}", content): class_type = "abstract"
-
-    methods      = extract_methods(content, class_name)
-    dependencies = extract_dependencies(content)
+    # Classify type from the declaration keyword and modifiers
+    class_type = m.group("kind")
+    if class_type == "class" and "abstract" in m.group("mods").split():
+        class_type = "abstract"
+
+    # Interfaces are skipped by the scan; don't parse their members
+    if class_type == "interface":
+        methods, dependencies = [], []
+    else:
+        methods      = extract_methods(content, class_name)
+        dependencies = extract_dependencies(content)
     has_static   = any(m2.get("isStatic") for m2 in methods)
     has_private  = any(m2.get("visibility") == "private" for m2 in methods)
 
@@ -220,18 +317,8 @@ def extract_class_info(file_path: Path) -> dict | None:
 
 
 def extract_methods(content: str, class_name: str) -> list:
-    pattern = re.compile(
-        r"(?P<visibility>public|private|protected)?\s*"
-        r"(?P<static>static)?\s*"
-        r"(?P<final>final)?\s*"
-        r"(?P<returnType>[\w<>,\s\[\]]+)\s+"
-        r"(?P<name>\w+)\s*"
-        r"\((?P<params>[^)]*)\)\s*"
-        r"(?:throws\s+(?P<throws>[\w,\s]+))?\s*\{",
-        re.MULTILINE,
-    )
     methods = []
-    for m in pattern.finditer(content):
+    for m in _METHOD_RE.finditer(content):
         method_name = m.group("name")
         return_type = (m.group("returnType") or "").strip()
         if return_type == method_name:
@@ -249,15 +336,10 @@ def extract_methods(content: str, class_name: str) -> list:
 
 
 def extract_dependencies(content: str) -> list:
-    skip = {
-        "int", "long", "double", "float", "boolean",
-        "String", "Integer", "Long", "Double", "Float", "Boolean",
-        "List", "Map", "Set", "Optional",
-    }
     deps = []
-    for m in re.finditer(r"private\s+(?:final\s+)?([\w]+(?:<[^>]+>)?)\s+(\w+)\s*[;=]", content):
+    for m in _FIELD_RE.finditer(content):
         t, n = m.group(1), m.group(2)
-        if t not in skip and t.lower() not in {s.lower() for s in skip}:
+        if t.lower() not in _SKIP_TYPES:
             deps.append({"type": t, "name": n})
     return deps
 
@@ -31,10 +31,17 @@ Exit codes: 0 = success, 1 = error
 """
 
 import json
+import os
 import sys
 from datetime import datetime, timezone
+from itertools import chain, islice
 from pathlib import Path
 
+try:
+    import orjson  # optional: faster JSON decoding/encoding
+except ImportError:
+    orjson = None
+
 PROGRESS_FILE = ".junit-progress.json"
 
 
@@ -96,7 +103,9 @@ def main():
     elif command == "reset":  reset_progress(progress_path, reset_target)
     elif command == "export":
         if progress_path.exists():
-            print(progress_path.read_text(encoding="utf-8"))
+            # Saved by orjson, non-ASCII text is not escaped, so the UTF-8
+            # bytes bypass the console encoding
+            sys.stdout.buffer.write(progress_path.read_bytes() + b"\n")
         else:
             print("{}", file=sys.stderr); sys.exit(1)
     else:
@@ -111,7 +120,7 @@ def main():
 def load_progress(path: Path) -> dict:
     if path.exists():
         try:
-            return json.loads(path.read_text(encoding="utf-8"))
+            return _loads(path.read_bytes())
         except (json.JSONDecodeError, OSError):
             pass
     return {}
@@ -119,12 +128,28 @@ def load_progress(path: Path) -> dict:
 
 def save_progress(path: Path, data: dict):
     data["lastUpdatedAt"] = datetime.now(timezone.utc).isoformat()
+    # Write a sibling temp file and rename it over the original, so an
+    # interrupted save never leaves a truncated progress file behind
+    tmp_path = path.with_name(path.name + ".tmp")
     try:
-        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp_path.write_bytes(_dumps(data))
+        os.replace(tmp_path, path)
     except OSError as e:
         print(f"Warning: Could not save {path}: {e}", file=sys.stderr)
 
 
+def _loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
 # ---------------------------------------------------------------------------
 # Commands
 # ---------------------------------------------------------------------------
@@ -185,11 +210,11 @@ def init_progress(progress_path: Path, project_root: str,
                   source_folder: str, test_folder: str, scan_file: str | None):
     """Initialise .junit-progress.json from scan_project.py JSON output."""
     if scan_file:
-        raw = Path(scan_file).read_text(encoding="utf-8")
+        raw = Path(scan_file).read_bytes()
     else:
-        raw = sys.stdin.read()
+        raw = sys.stdin.buffer.read()
 
-    scan_data = json.loads(raw)
+    scan_data = _loads(raw)
 
     # Preserve already-completed entries from an existing progress file
     existing       = load_progress(progress_path)
@@ -282,10 +307,12 @@ def next_batch(progress_path: Path, batch_size: int):
     """Print the next in_progress then pending class names as a JSON array."""
     data  = load_progress(progress_path)
     files = data.get("files", {})
-    # in_progress first (resume interrupted work), then pending
-    result = [k for k, v in files.items() if v.get("status") == "in_progress"]
-    result += [k for k, v in files.items() if v.get("status") == "pending"]
-    print(json.dumps(result[:batch_size], indent=2))
+    # in_progress first (resume interrupted work), then pending; stop as
+    # soon as the batch is full rather than collecting every match
+    in_progress = (k for k, v in files.items() if v.get("status") == "in_progress")
+    pending     = (k for k, v in files.items() if v.get("status") == "pending")
+    result = list(islice(chain(in_progress, pending), batch_size))
+    print(json.dumps(result, indent=2))
 
 
 def reset_progress(progress_path: Path, target: str):
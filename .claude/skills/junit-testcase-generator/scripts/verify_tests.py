@@ -2,7 +2,8 @@
 """Verify a generated JUnit test class using Maven.
 
 Runs: mvn test -Dtest=<ClassName>
-Parses surefire output and compilation errors.
+Parses the Surefire XML reports (falling back to console output) and
+compilation errors.
 Outputs JSON or human-readable summary.
 
 Usage:
@@ -12,21 +13,103 @@ Options:
   --test-class <name>     Fully-qualified or simple test class name (required)
   --project-root <path>   Project root containing pom.xml (default: .)
   --output <format>       json | summary  (default: summary)
+  --no-daemon             Use mvn even when the Maven Daemon (mvnd) is installed
+  --parallel              Build modules in parallel, one thread per core (-T 1C)
+  --offline               Do not check remote repositories (-o)
+  --maven-args "<args>"   Extra arguments passed to Maven as-is
+  --timeout <seconds>     Kill the Maven run after this long (default: 300)
 
 Exit codes: 0 = all tests pass, 1 = failure or error
 """
 
 import json
+import os
 import re
+import shlex
+import shutil
+import signal
 import subprocess
 import sys
+import threading
+import xml.etree.ElementTree as ET
+from collections import deque
+from fnmatch import fnmatchcase
 from pathlib import Path
+from types import MappingProxyType
+from typing import Optional
+
+try:
+    import orjson  # optional: faster JSON encoding
+except ImportError:
+    orjson = None
+
+# Resolved once; on Windows Maven is a mvn.cmd script, which is run directly
+# rather than through a "cmd /c" shell. An unresolved name surfaces as the
+# FileNotFoundError handled in run_maven.
+MVN = shutil.which("mvn") or shutil.which("mvn.cmd") or "mvn"
+# The Maven Daemon takes the same arguments and keeps a warm JVM between
+# builds; preferred when installed
+MVND = shutil.which("mvnd") or shutil.which("mvnd.cmd")
+
+# Seconds a Maven run may take before it is killed
+DEFAULT_TIMEOUT = 300
+
+# Output lines kept from a Maven run; older lines are dropped as it streams,
+# and each is cut to OUTPUT_LINE_CHARS as it is read
+OUTPUT_LINES = 200_000
+OUTPUT_LINE_CHARS = 4096
+
+# Summary line: Tests run: X, Failures: Y, Errors: Z, Skipped: W
+_SUMMARY_RE = re.compile(
+    r"Tests run:\s*(\d+),\s*Failures:\s*(\d+),\s*Errors:\s*(\d+),\s*Skipped:\s*(\d+)")
+# Failure header: method(class)  Time elapsed: ... <<< FAILURE! (matched per line)
+_FAILURE_RE = re.compile(r"(\w+)\(([^)]+)\)\s+Time elapsed:.*<<<\s*(FAILURE|ERROR)!")
+_ERR_RE = re.compile(
+    r"\[ERROR\]\s*([^\:\[\]]+\.java):\[(\d+),(\d+)\]\s*(?:error:)?\s*(.+)", re.MULTILINE)
+_ALT_ERR_RE = re.compile(
+    r"\[ERROR\]\s*([^\:\[\]]+\.java):(\d+):\s*(?:error:)?\s*(.+)", re.MULTILINE)
+
+# Compilation error keywords in priority order, and the category of each;
+# "cannot find symbol" is refined by the kind of symbol
+_ERROR_KEYWORDS = {
+    "cannot find symbol":           None,
+    "incompatible types":           "type_mismatch",
+    "cannot be applied":            "wrong_arguments",
+    "private access":               "private_access",
+    "not visible":                  "not_visible",
+    "package does not exist":       "missing_dependency",
+    "unreported exception":         "unhandled_exception",
+    "non-static":                   "static_context",
+    "unnecessarystubbingexception": "unnecessary_stubbing",
+}
+_SYMBOL_KINDS = {"class": "missing_import", "method": "wrong_method_name", "variable": "wrong_variable"}
+_ERROR_KEYWORD_RE = re.compile("|".join(map(re.escape, _ERROR_KEYWORDS)))
+_SYMBOL_KIND_RE = re.compile("|".join(_SYMBOL_KINDS))
+
+# Fix suggestion for each error category
+_SUGGESTIONS = MappingProxyType({
+    "missing_import":       "Add missing import. Check if class is on classpath.",
+    "wrong_method_name":    "Verify method name/signature matches the source class.",
+    "wrong_variable":       "Check variable name exists in scope.",
+    "type_mismatch":        "Fix type mismatch. Check expected vs actual types.",
+    "wrong_arguments":      "Method arguments don't match signature. Check types/count.",
+    "private_access":       "Use reflection (getDeclaredMethod/getDeclaredField) for private members.",
+    "not_visible":          "Member is not accessible. Use reflection or widen visibility.",
+    "missing_dependency":   "Add missing dependency to pom.xml.",
+    "unhandled_exception":  "Add 'throws' clause or wrap in try-catch.",
+    "static_context":       "Cannot access instance member from static context.",
+    "unnecessary_stubbing": "Remove unused stub or annotate with @MockitoSettings(strictness=LENIENT).",
+    "unknown":              "Review error message and fix accordingly.",
+})
 
 
 def main():
     project_root = "."
     test_class   = None
     output_format = "summary"
+    daemon        = True
+    maven_args: list[str] = []
+    timeout       = DEFAULT_TIMEOUT
 
     args = sys.argv[1:]
     i = 0
@@ -35,6 +118,11 @@ def main():
         if   a == "--project-root": project_root  = args[i + 1]; i += 2
         elif a == "--test-class":   test_class    = args[i + 1]; i += 2
         elif a == "--output":       output_format = args[i + 1]; i += 2
+        elif a == "--no-daemon":    daemon        = False;        i += 1
+        elif a == "--parallel":     maven_args   += ["-T", "1C"]; i += 1
+        elif a == "--offline":      maven_args.append("-o");      i += 1
+        elif a == "--maven-args":   maven_args   += _split_args(args[i + 1]); i += 2
+        elif a == "--timeout":      timeout       = float(args[i + 1]); i += 2
         else: i += 1
 
     if not (Path(project_root) / "pom.xml").exists():
@@ -46,18 +134,24 @@ def main():
         print(__doc__, file=sys.stderr)
         sys.exit(1)
 
-    success, raw_output = run_maven(project_root, "test", f"-Dtest={test_class}")
-    results  = parse_surefire_output(raw_output)
+    maven = MVND if daemon and MVND else MVN
+    # A stale report must not stand in for a class that did not run
+    remove_surefire_reports(project_root, test_class)
+    success, raw_output = run_maven(project_root, *maven_args, "test", f"-Dtest={test_class}",
+                                    executable=maven, timeout=timeout)
+    results  = parse_surefire_reports(project_root, test_class)
+    if results is None:
+        results = parse_surefire_output(raw_output)
     comp_errs = parse_compilation_errors(raw_output)
 
     if output_format == "json":
-        print(json.dumps({
+        _print_json({
             "success":           success,
             "testClass":         test_class,
             "results":           results,
             "compilationErrors": [_enrich(e) for e in comp_errs],
             "output":            raw_output[:3000],
-        }, indent=2))
+        })
     else:
         if success:
             total  = results.get("total", 0)
@@ -82,43 +176,192 @@ def main():
     sys.exit(0 if success else 1)
 
 
+def _print_json(data) -> None:
+    if orjson is not None:
+        # orjson leaves non-ASCII text (e.g. Maven output) unescaped, so its
+        # UTF-8 bytes bypass the console encoding, which may not hold them
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(data, indent=2))
+
+
 # ---------------------------------------------------------------------------
 # Maven execution
 # ---------------------------------------------------------------------------
 
-def run_maven(project_root: str, *maven_args: str) -> tuple[bool, str]:
-    is_win = sys.platform.startswith("win")
-    cmd = (["cmd", "/c", "mvn"] if is_win else ["mvn"]) + list(maven_args)
+def _split_args(text: str) -> list[str]:
+    """Split a --maven-args string into arguments.
+
+    On Windows backslashes are path separators, so POSIX rules (which treat
+    them as escapes) would turn C:\\Users\\me into C:Usersme. Non-POSIX
+    splitting keeps the quotes around an argument, which are dropped here.
+    """
+    if not sys.platform.startswith("win"):
+        return shlex.split(text)
+    return [
+        arg[1:-1] if len(arg) > 1 and arg[0] == arg[-1] and arg[0] in "\"'" else arg
+        for arg in shlex.split(text, posix=False)
+    ]
+
+
+def _kill_tree(proc: subprocess.Popen) -> None:
+    """Kill ``proc`` and everything it started.
+
+    mvn is a wrapper script that may not exec the JVM, so killing the direct
+    child alone can leave the build running and holding the output pipe.
+    """
+    if sys.platform.startswith("win"):
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       creationflags=subprocess.CREATE_NO_WINDOW)
+    else:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def run_maven(project_root: str, *maven_args: str, executable: str = MVN,
+              timeout: float = DEFAULT_TIMEOUT) -> tuple[bool, str]:
+    cmd = [executable, *maven_args]
+    windows = sys.platform.startswith("win")
+    # No console window for the child on Windows
+    creationflags = subprocess.CREATE_NO_WINDOW if windows else 0
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
             cwd=project_root,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
             encoding="utf-8",
             errors="replace",
-            timeout=300,
+            creationflags=creationflags,
+            # Its own process group, so a timeout can kill the whole build
+            start_new_session=not windows,
         )
-        combined = result.stdout + result.stderr
-        return result.returncode == 0, combined
-    except subprocess.TimeoutExpired:
-        return False, "Maven command timed out after 300 seconds."
     except FileNotFoundError:
         return False, "mvn not found. Ensure Maven is installed and on PATH."
 
+    # Reading the pipe blocks, so the timeout is enforced by killing the build
+    expired = threading.Event()
+
+    def kill():
+        expired.set()
+        _kill_tree(proc)
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        with proc.stdout:
+            tail = deque(
+                (line if len(line) <= OUTPUT_LINE_CHARS else line[:OUTPUT_LINE_CHARS] + "\n"
+                 for line in proc.stdout),
+                maxlen=OUTPUT_LINES,
+            )
+        returncode = proc.wait()
+    except BaseException:
+        # The build is outside our process group and misses Ctrl-C
+        _kill_tree(proc)
+        raise
+    finally:
+        timer.cancel()
+    if expired.is_set():
+        return False, f"Maven command timed out after {timeout:g} seconds."
+    return returncode == 0, "".join(tail)
+
 
 # ---------------------------------------------------------------------------
 # Output parsing
 # ---------------------------------------------------------------------------
 
+def surefire_reports(project_root: str, test_class: str) -> list:
+    """Return the module's TEST-*.xml reports of the classes ``test_class`` selects.
+
+    ``test_class`` is the -Dtest value: comma-separated simple or fully
+    qualified names, optionally with wildcards or a #method suffix.
+    """
+    selectors = [
+        name.split("#", 1)[0].strip()
+        for name in test_class.split(",")
+        if name.strip() and not name.strip().startswith("!")
+    ]
+    try:
+        entries = list(os.scandir(Path(project_root) / "target" / "surefire-reports"))
+    except OSError:
+        return []
+    reports = []
+    for entry in entries:
+        if not (entry.name.startswith("TEST-") and entry.name.endswith(".xml")):
+            continue
+        full_name = entry.name[len("TEST-"):-len(".xml")]
+        simple_name = full_name.rsplit(".", 1)[-1]
+        if any(fnmatchcase(full_name if "." in selector else simple_name, selector) for selector in selectors):
+            reports.append(Path(entry.path))
+    return sorted(reports)
+
+
+def remove_surefire_reports(project_root: str, test_class: str) -> None:
+    for report in surefire_reports(project_root, test_class):
+        try:
+            report.unlink()
+        except OSError:
+            pass
+
+
+def parse_surefire_reports(project_root: str, test_class: str) -> Optional[dict]:
+    """Aggregate the Surefire XML reports of the classes ``test_class`` selects.
+
+    Returns None when there are none (e.g. compilation failed before any
+    test ran), in which case the console output is the only source.
+    """
+    reports = surefire_reports(project_root, test_class)
+    if not reports:
+        return None
+
+    results = {"total": 0, "passed": 0, "failed": 0, "errors": 0, "skipped": 0, "failures": []}
+    for report in reports:
+        counts = {"total": 0, "failed": 0, "errors": 0, "skipped": 0}
+        failures = []
+        try:
+            for _, elem in ET.iterparse(report, events=("end",)):
+                if elem.tag == "testcase":
+                    for child in elem:
+                        if child.tag in ("failure", "error"):
+                            # "<exception type>: <message>", as on the console;
+                            # the body (stack trace) already starts with the type
+                            message = child.get("message")
+                            if message is None:
+                                message = child.text or ""
+                            elif child.get("type"):
+                                message = f"{child.get('type')}: {message}"
+                            failures.append({
+                                "method":  elem.get("name"),
+                                "class":   elem.get("classname"),
+                                "type":    child.tag.upper(),
+                                "message": message.strip()[:500],
+                            })
+                    elem.clear()
+                elif elem.tag == "testsuite":
+                    for key, attr in (("total", "tests"), ("failed", "failures"),
+                                      ("errors", "errors"), ("skipped", "skipped")):
+                        counts[key] += int(elem.get(attr) or 0)
+        except (ET.ParseError, ValueError, OSError):
+            continue  # report malformed or gone
+        for key, value in counts.items():
+            results[key] += value
+        results["failures"].extend(failures)
+
+    results["passed"] = results["total"] - results["failed"] - results["errors"] - results["skipped"]
+    return results
+
+
 def parse_surefire_output(output: str) -> dict:
     results = {"total": 0, "passed": 0, "failed": 0, "errors": 0, "skipped": 0, "failures": []}
 
-    # Summary line: Tests run: X, Failures: Y, Errors: Z, Skipped: W
-    m = re.search(
-        r"Tests run:\s*(\d+),\s*Failures:\s*(\d+),\s*Errors:\s*(\d+),\s*Skipped:\s*(\d+)",
-        output,
-    )
+    m = _SUMMARY_RE.search(output)
     if m:
         total, failed, errors, skipped = (int(m.group(x)) for x in (1, 2, 3, 4))
         results.update({
@@ -129,47 +372,52 @@ def parse_surefire_output(output: str) -> dict:
             "passed":  total - failed - errors - skipped,
         })
 
-    # Individual failure details
+    # Individual failure details: a header line, then its message and stack
+    # trace up to the next blank line or header
     failures = []
-    for fm in re.finditer(
-        r"(\w+)\(([^)]+)\)\s+Time elapsed:.*?<<<\s*(FAILURE|ERROR)!\s*\n(.*?)(?=\n\n|\n\w+\(|$)",
-        output,
-        re.DOTALL,
-    ):
+    lines = output.splitlines()
+    i = 0
+    while i < len(lines):
+        fm = _failure_header(lines[i])
+        i += 1
+        if fm is None:
+            continue
+        body_start = i
+        while i < len(lines) and lines[i].strip() and not _failure_header(lines[i]):
+            i += 1
         failures.append({
             "method":  fm.group(1),
             "class":   fm.group(2),
             "type":    fm.group(3),
-            "message": fm.group(4).strip()[:500],
+            "message": "\n".join(lines[body_start:i]).strip()[:500],
         })
     results["failures"] = failures
     return results
 
 
+def _failure_header(line: str):
+    # The substring test keeps the regex off the vast majority of lines
+    return _FAILURE_RE.search(line) if "<<<" in line else None
+
+
 def parse_compilation_errors(output: str) -> list:
     errors: list[dict] = []
-    seen: set[str] = set()
+    seen: set[tuple[str, int]] = set()
 
     # Format 1: [ERROR] /path/File.java:[line,col] error: message
-    for m in re.finditer(
-        r"\[ERROR\]\s*([^\:\[\]]+\.java):\[(\d+),(\d+)\]\s*(?:error:)?\s*(.+)",
-        output, re.MULTILINE,
-    ):
-        key = f"{m.group(1).strip()}:{m.group(2)}"
+    for m in _ERR_RE.finditer(output):
+        key = (m.group(1).strip(), int(m.group(2)))
         if key not in seen:
             seen.add(key)
-            errors.append({"file": m.group(1).strip(), "line": int(m.group(2)),
+            errors.append({"file": key[0], "line": key[1],
                            "column": int(m.group(3)), "message": m.group(4).strip()})
 
     # Format 2: [ERROR] /path/File.java:line: message
-    for m in re.finditer(
-        r"\[ERROR\]\s*([^\:\[\]]+\.java):(\d+):\s*(?:error:)?\s*(.+)",
-        output, re.MULTILINE,
-    ):
-        key = f"{m.group(1).strip()}:{m.group(2)}"
+    for m in _ALT_ERR_RE.finditer(output):
+        key = (m.group(1).strip(), int(m.group(2)))
         if key not in seen:
             seen.add(key)
-            errors.append({"file": m.group(1).strip(), "line": int(m.group(2)),
+            errors.append({"file": key[0], "line": key[1],
                            "column": 0, "message": m.group(3).strip()})
 
     return errors
@@ -179,21 +427,24 @@ def _enrich(error: dict) -> dict:
     return {**error, "suggestion": _suggest(error)}
 
 
-def _suggest(error: dict) -> str:
+def _categorize(error: dict) -> str:
     msg = error.get("message", "").lower()
-    if "cannot find symbol" in msg:
-        if "class"    in msg: return "Add missing import. Check if class is on classpath."
-        if "method"   in msg: return "Verify method name/signature matches the source class."
-        if "variable" in msg: return "Check variable name exists in scope."
-    if "incompatible types"  in msg: return "Fix type mismatch. Check expected vs actual types."
-    if "cannot be applied"   in msg: return "Method arguments don't match signature. Check types/count."
-    if "private access"      in msg: return "Use reflection (getDeclaredMethod/getDeclaredField) for private members."
-    if "not visible"         in msg: return "Member is not accessible. Use reflection or widen visibility."
-    if "package does not exist" in msg: return "Add missing dependency to pom.xml."
-    if "unreported exception"   in msg: return "Add 'throws' clause or wrap in try-catch."
-    if "non-static" in msg and "static" in msg: return "Cannot access instance member from static context."
-    if "unnecessarystubbingexception" in msg: return "Remove unused stub or annotate with @MockitoSettings(strictness=LENIENT)."
-    return "Review error message and fix accordingly."
+    # One pass over the message; the keywords found are then taken by priority
+    found = {m.group() for m in _ERROR_KEYWORD_RE.finditer(msg)}
+    for keyword, category in _ERROR_KEYWORDS.items():
+        if keyword not in found:
+            continue
+        if category is not None:
+            return category
+        kinds = {m.group() for m in _SYMBOL_KIND_RE.finditer(msg)}
+        for kind, symbol_category in _SYMBOL_KINDS.items():
+            if kind in kinds:
+                return symbol_category
+    return "unknown"
+
+
+def _suggest(error: dict) -> str:
+    return _SUGGESTIONS[_categorize(error)]
 
 
 if __name__ == "__main__":